@@ -6,15 +6,32 @@ RSS парсер для подкаста «Волна с Востока»
 """
 
 import argparse
+import dataclasses
 import feedparser
+import functools
+import hashlib
 import json
 import os
 import re
 import sys
-from datetime import datetime, timezone
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from html import unescape
+from operator import attrgetter
 from email.utils import parsedate_to_datetime
 
+try:
+    from lxml import etree
+except ImportError:  # lxml не обязателен — тогда всё разбирает feedparser
+    etree = None
+
+try:
+    import orjson
+except ImportError:  # без orjson работаем на стандартном json
+    orjson = None
+
 DEFAULT_RSS = os.getenv("RSS_URL")
 # Проверяем что RSS_URL установлен
 if not DEFAULT_RSS:
@@ -24,16 +41,91 @@ if not DEFAULT_RSS:
 
 DEFAULT_OUT = "episodes.json"
 EXTRAS_FILE = os.getenv("EXTRAS_FILE", "extras_map.json")
+FEED_CACHE = os.getenv("FEED_CACHE", "feed.cache.json")
+USER_AGENT = "volna-podcast-parser/1.0"
+
+_ITUNES_NS = "{http://www.itunes.com/dtds/podcast-1.0.dtd}"
+_CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+_SUMMARY_TAGS = ("description", _ITUNES_NS + "summary")
+
+# Регулярки компилируем один раз при импорте
+# Серии тегов/пробелов схлопываются в один пробел за один проход
+_TAG_WS_RE = re.compile(r"(?:<[^>]+>|\s)+")
+_URL_RE = re.compile(r"https?://\S+")
+_HMS_RE = re.compile(r"\d{1,2}:\d{2}(?::\d{2})?")
+_UNIT_RE = re.compile(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?")
+# санитайзер feedparser выкидывает эти элементы вместе с содержимым
+_UNSAFE_RE = re.compile(r"<(script|style|applet)\b.*?</\1\s*>", re.S | re.I)
+
+_AUDIO_TYPES = frozenset({"audio/mpeg", "audio/mp3", "audio/aac"})
+_EXPLICIT_TRUE = frozenset({"yes", "true", "1", "y", "t"})
+
+_MON_MAP = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+_UTC_ZONES = frozenset({"+0000", "-0000", "GMT", "UT", "UTC", "Z"})
+
+# "00".."99" — готовые двузначные строки для минут/секунд и дат
+_DD = tuple(f"{i:02d}" for i in range(100))
+
+@dataclasses.dataclass(slots=True)
+class Episode:
+    """Один выпуск; порядок полей = порядок ключей в episodes.json."""
+    name: str
+    desc: str
+    link: str
+    audio_url: str
+    image: str
+    date: str
+    year: int | None
+    duration: str
+    episode_number: int | str
+    season: int | str
+    episode_type: str
+    guid: str
+    explicit: bool
+    page: str
+    # «сырая» дата для сортировки/отладки (ISO, UTC)
+    pub_iso: str
+
+
+def _json_default(o):
+    if isinstance(o, Episode):
+        return dataclasses.asdict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    """UTF-8 JSON с отступом 2 — то же, что json.dumps(obj, ensure_ascii=False, indent=2)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            # orjson не умеет, например, int шире 64 бит — отдаём стандартному json
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default).encode("utf-8")
+
 
 def clean_html(text: str) -> str:
     """Грубое удаление HTML-тегов + unescape, схлопывание пробелов."""
     if not text:
         return ""
-    text = unescape(text)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    if "&" in text:
+        text = unescape(text)
+    # Обычный текст без тегов и ссылок: хватит схлопнуть пробелы
+    if "<" not in text and "http" not in text:
+        return " ".join(text.split())
+    text = _TAG_WS_RE.sub(" ", text)
     # Если ссылки в описании не нужны для сайта – убираем:
-    text = re.sub(r"https?://\S+", "", text)
+    text = _URL_RE.sub("", text)
     return text.strip()
 
 
@@ -43,18 +135,27 @@ def parse_duration(raw) -> str:
         return ""
     s = str(raw).strip()
 
+    # Самый частый случай в iTunes — целое число секунд ("3723")
+    if s.isdecimal():
+        h, rem = divmod(int(s), 3600)
+        mi, sec = divmod(rem, 60)
+        if h > 0:
+            return f"{h}:{_DD[mi]}:{_DD[sec]}"
+        return f"{mi}:{_DD[sec]}"
+
     # Если уже формата H:MM:SS или M:SS — оставляем
-    if re.fullmatch(r"\d{1,2}:\d{2}(:\d{2})?", s):
+    if ":" in s and _HMS_RE.fullmatch(s):
         # Приведём к H:MM:SS при возможности
         parts = list(map(int, s.split(":")))
         if len(parts) == 2:
             m, sec = parts
-            return f"{m}:{sec:02d}"
+            return f"{m}:{_DD[sec]}"
         h, m, sec = (parts + [0, 0])[:3]
-        return f"{h}:{m:02d}:{sec:02d}"
+        return f"{h}:{_DD[m]}:{_DD[sec]}"
 
-    # Варианты "3723", "1h02m03s", "95m12s"
-    m = re.fullmatch(r"(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?", s.lower())
+    # Варианты "1h02m03s", "95m12s"
+    low = s.lower()
+    m = ("h" in low or "m" in low or "s" in low) and _UNIT_RE.fullmatch(low)
     if m and any(m.groups()):
         h = int(m.group(1) or 0)
         mi = int(m.group(2) or 0)
@@ -75,37 +176,85 @@ def parse_duration(raw) -> str:
         return s
         
 def load_extras_map(path: str) -> dict:
-    """Загружает карту доп.полей по номеру эпизода."""
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return data
-        except Exception as e:
-            print(f"⚠️ Не удалось прочитать {path}: {e}")
+    """Загружает карту доп.полей по номеру эпизода.
+
+    Результат кэшируется по (path, mtime): файл перечитывается, только если изменился.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    return _load_extras_map(path, mtime)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_extras_map(path: str, mtime: float) -> dict:
+    try:
+        with open(path, "rb") as f:
+            data = _loads(f.read())
+            if isinstance(data, dict):
+                return data
+    except Exception as e:
+        print(f"⚠️ Не удалось прочитать {path}: {e}")
     return {}
 
+def _is_int_str(s: str) -> bool:
+    """Строка из цифр с необязательным знаком — то, что int() примет без исключения."""
+    return (s[1:] if s[:1] in ("-", "+") else s).isdecimal()
+
+
 def norm_epnum(v) -> str:
     """Нормализует episode_number к строке ('8', '12'...), чтобы ключи совпадали с JSON-картой."""
     if v is None or v == "":
         return ""
+    if isinstance(v, int):
+        return str(v)
+    # если вдруг в RSS строка, сохраняем как есть (например, 'S1E8')
+    s = str(v).strip()
+    return str(int(s)) if _is_int_str(s) else s
+
+
+def _fast_pubdate(s: str) -> datetime | None:
+    """Быстрый разбор pubDate фиксированного вида 'Tue, 12 Nov 2024 07:45:36 +0000' в UTC.
+
+    Всё, что не укладывается в этот шаблон, возвращает None — тогда разбирает parsedate_to_datetime.
+    """
+    if len(s) < 27 or s[3] != "," or s[19] != ":" or s[22] != ":":
+        return None
+    if s[7] != " " or s[11] != " " or s[16] != " " or s[25] != " ":
+        return None
+    mon = _MON_MAP.get(s[8:11])
+    if mon is None:
+        return None
+    tz = s[26:]
     try:
-        return str(int(v))
-    except Exception:
-        # если вдруг в RSS строка, сохраняем как есть (например, 'S1E8')
-        return str(v).strip()
+        year = int(s[12:16])
+        # двузначные годы parsedate_to_datetime дополняет до 19xx/20xx — не наш случай
+        if year < 1000:
+            return None
+        dt = datetime(year, mon, int(s[5:7]), int(s[17:19]), int(s[20:22]), int(s[23:25]),
+                      tzinfo=timezone.utc)
+        if tz in _UTC_ZONES:
+            return dt
+        if len(tz) == 5 and tz[0] in "+-" and tz[1:].isdigit():
+            offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5]))
+            if offset < timedelta(hours=24):
+                return dt - offset if tz[0] == "+" else dt + offset
+    except (ValueError, OverflowError):
+        pass
+    return None
 
 
 def coerce_datetime(entry) -> tuple[datetime | None, str, int | None]:
-    """Достаём дату: published/updated (parsed -> datetime), строку для вывода и год."""
+    """Достаём дату: published/updated (parsed -> datetime в UTC), строку для вывода и год."""
     dt = None
 
     # Parsed поля
     for k in ("published_parsed", "updated_parsed", "created_parsed"):
-        if getattr(entry, k, None):
+        pp = getattr(entry, k, None)
+        if pp:
             try:
-                dt = datetime(*getattr(entry, k)[:6], tzinfo=timezone.utc)
+                dt = datetime(*pp[:6], tzinfo=timezone.utc)
                 break
             except Exception:
                 pass
@@ -115,17 +264,25 @@ def coerce_datetime(entry) -> tuple[datetime | None, str, int | None]:
         for k in ("published", "updated", "created"):
             v = entry.get(k)
             if v:
+                dt = _fast_pubdate(v)
+                if dt is not None:
+                    break
                 try:
                     dt = parsedate_to_datetime(v)
-                    # Приведём naive к UTC
-                    if dt and dt.tzinfo is None:
+                    # Приведём к UTC (naive считаем уже UTC)
+                    if dt.tzinfo is None:
                         dt = dt.replace(tzinfo=timezone.utc)
+                    else:
+                        dt = dt.astimezone(timezone.utc)
                     break
                 except Exception:
                     continue
 
-    # Формат для вывода
-    date_str = dt.astimezone(timezone.utc).strftime("%d.%m.%Y") if dt else ""
+    # Формат для вывода (dt здесь всегда в UTC)
+    if dt:
+        date_str = f"{_DD[dt.day]}.{_DD[dt.month]}.{dt.year}"
+    else:
+        date_str = ""
     year = dt.year if dt else None
     return dt, date_str, year
 
@@ -134,15 +291,18 @@ def pick_audio(entry) -> str:
     """Ищем аудио сначала в enclosures, потом в links[rel=enclosure]."""
     # enclosures
     for enc in entry.get("enclosures", []):
-        t = (enc.get("type") or "").lower()
-        if "audio" in t or t in {"audio/mpeg", "audio/mp3", "audio/aac"}:
-            return enc.get("href") or ""
+        t = enc.get("type")
+        if t:
+            tl = t.lower()
+            if "audio" in tl or tl in _AUDIO_TYPES:
+                return enc.get("href") or ""
 
     # links rel=enclosure
     for ln in entry.get("links", []):
         if ln.get("rel") == "enclosure":
-            t = (ln.get("type") or "").lower()
-            if not t or "audio" in t or t in {"audio/mpeg", "audio/mp3", "audio/aac"}:
+            t = ln.get("type")
+            tl = t.lower() if t else ""
+            if not tl or "audio" in tl or tl in _AUDIO_TYPES:
                 return ln.get("href") or ""
 
     return ""
@@ -165,91 +325,395 @@ def pick_image(entry) -> str:
 
 
 def to_int_or_str(v):
+    if v is None:
+        return ""
+    s = str(v)
+    return int(s) if _is_int_str(s.strip()) else s
+
+
+def _description_alias(raw: dict):
+    """То, что вернул бы FeedParserDict.get("description"): summary, если ключ есть, иначе subtitle."""
+    if "summary" in raw:
+        return raw["summary"]
+    if "subtitle" in raw:
+        return raw["subtitle"]
+    return raw.get("description")
+
+
+def _first(raw: dict, *keys):
+    """Первое непустое значение по списку ключей (или "")."""
+    return next((raw[k] for k in keys if raw.get(k)), "")
+
+
+def fetch_feed(rss_url: str, validators: dict | None = None) -> tuple[bytes | None, dict, dict]:
+    """Скачивает ленту (или читает локальный файл) целиком.
+
+    С validators (ETag/Last-Modified прошлого запуска) делает условный GET:
+    если лента не менялась, сервер отвечает 304 и вместо данных приходит None.
+    Ещё возвращает валидаторы текущего ответа и его заголовки (ключи в нижнем
+    регистре, как их ждёт feedparser — например, charset из Content-Type).
+    """
+    if "://" not in rss_url:
+        with open(rss_url, "rb") as f:
+            return f.read(), {}, {}
+    headers = {"User-Agent": USER_AGENT}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    req = urllib.request.Request(rss_url, headers=headers)
     try:
-        return int(v)
-    except Exception:
-        return str(v) if v is not None else ""
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            data = resp.read()
+            resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and validators:
+            return None, validators, {}
+        raise
+    etag = resp_headers.get("etag")
+    last_modified = resp_headers.get("last-modified")
+    new = {}
+    if etag:
+        new["etag"] = etag
+    if last_modified:
+        new["last_modified"] = last_modified
+    return data, new, resp_headers
+
+
+def _xml_text(item, tag: str) -> str:
+    return (item.findtext(tag) or "").strip()
+
+
+def _strip_unsafe(html: str) -> str:
+    """<script>/<style>/<applet> вместе с содержимым — как санитайзер feedparser для HTML-полей."""
+    if "<" not in html:
+        return html
+    return _UNSAFE_RE.sub("", html)
+
+
+def _xml_attrs(el) -> dict:
+    # feedparser приводит имена атрибутов к нижнему регистру
+    return {k.lower(): v for k, v in el.attrib.items()}
+
+
+def lxml_entry(item) -> dict:
+    """<item> -> dict с теми же ключами, что выдаёт feedparser для RSS 2.0."""
+    entry = {
+        "link": _xml_text(item, "link"),
+        "published": _xml_text(item, "pubDate"),
+        "itunes_duration": _xml_text(item, _ITUNES_NS + "duration"),
+        "itunes_episode": _xml_text(item, _ITUNES_NS + "episode"),
+        "itunes_season": _xml_text(item, _ITUNES_NS + "season"),
+        "itunes_episodetype": _xml_text(item, _ITUNES_NS + "episodeType"),
+        "enclosures": [
+            {"href": enc.get("url", ""), "type": enc.get("type", "")}
+            for enc in item.iterfind("enclosure")
+        ],
+    }
+    # без <title> ключа нет — тогда в выпуске будет «Без названия»
+    title = item.find("title")
+    if title is not None:
+        entry["title"] = (title.text or "").strip()
+
+    # описание раскладываем как feedparser: первый из description/itunes:summary
+    # идёт в summary, второй (если content ещё пуст) — в content, остальные
+    # перезаписывают summary; content:encoded всегда дописывается в content
+    summary = None
+    content = []
+    has_content = False
+    for child in item:
+        tag = child.tag
+        if tag in _SUMMARY_TAGS:
+            text = (child.text or "").strip()
+            if summary is not None and not has_content:
+                # сюда feedparser кладёт text/plain и не санитизирует
+                has_content = True
+                content.append({"value": text})
+            else:
+                # description в summary — text/html, его feedparser санитизирует
+                summary = _strip_unsafe(text) if tag == "description" else text
+        elif tag == _CONTENT_NS + "encoded":
+            text = _strip_unsafe((child.text or "").strip())
+            has_content = True
+            content.append({"value": text})
+            if summary is None:
+                summary = text
+        elif tag == _ITUNES_NS + "subtitle":
+            entry["subtitle"] = (child.text or "").strip()
+    if summary is not None:
+        entry["summary"] = summary
+    if content:
+        entry["content"] = content
+
+    # как в feedparser: True только для "yes", False для "clean", иначе None
+    explicit = item.find(_ITUNES_NS + "explicit")
+    if explicit is not None:
+        value = (explicit.text or "").strip()
+        entry["itunes_explicit"] = True if value == "yes" else (False if value == "clean" else None)
+
+    guid = item.find("guid")
+    if guid is not None:
+        entry["id"] = (guid.text or "").strip()
+        # как в feedparser: guid служит ссылкой, если isPermaLink не false и <link> нет
+        if not entry["link"] and guid.get("isPermaLink", "true") == "true":
+            entry["link"] = entry["id"]
+
+    # feedparser кладёт itunes:image эпизода в "image"
+    image = item.find(_ITUNES_NS + "image")
+    if image is not None and image.get("href"):
+        entry["image"] = {"href": image.get("href")}
+
+    # media:* ищем и внутри media:group, как feedparser
+    thumbnails = []
+    for el in item.iter(_MEDIA_NS + "thumbnail"):
+        attrs = _xml_attrs(el)
+        if "url" not in attrs and el.text and el.text.strip():
+            attrs["url"] = el.text.strip()
+        thumbnails.append(attrs)
+    if thumbnails:
+        entry["media_thumbnail"] = thumbnails
+    media_content = [_xml_attrs(el) for el in item.iter(_MEDIA_NS + "content")]
+    if media_content:
+        entry["media_content"] = media_content
+    return entry
+
+
+def load_feed(rss_url: str, validators: dict | None = None) -> tuple[list | None, str | None, dict]:
+    """Записи ленты, текст предупреждения (если разбор прошёл не гладко) и валидаторы ответа.
+
+    RSS 2.0 читаем через lxml (libxml2), всё остальное и битый XML —
+    через feedparser. Записи = None, если лента не изменилась (304).
+    Ошибки загрузки (OSError) не глотаются — их собирает _gather_feeds.
+    """
+    data, validators, resp_headers = fetch_feed(rss_url, validators)
+    if data is None:
+        return None, None, validators
+
+    if etree is not None:
+        try:
+            root = etree.fromstring(data, etree.XMLParser(resolve_entities=False, no_network=True))
+        except etree.XMLSyntaxError:
+            root = None
+        if root is not None and root.tag == "rss":
+            return [lxml_entry(item) for item in root.iterfind("channel/item")], None, validators
+    feed = feedparser.parse(data, response_headers=resp_headers)
+
+    warning = None
+    if getattr(feed, "bozo", False):
+        warning = str(getattr(feed, "bozo_exception", "unknown parse issue"))
+    return feed.entries or [], warning, validators
 
 
-def parse_rss_to_json(rss_url: str, out_path: str) -> int:
-    print(f"Загружаю RSS: {rss_url}")
-    feed = feedparser.parse(rss_url)
-    extras_map = load_extras_map(EXTRAS_FILE)
+def _gather_feeds(rss_urls: list[str], futures: list) -> list | None:
+    """Результаты load_feed по порядку лент; None, если хоть одна не загрузилась."""
+    feeds = []
+    for rss_url, future in zip(rss_urls, futures):
+        try:
+            feeds.append(future.result())
+        except OSError as e:
+            print(f"❌ Не удалось загрузить {rss_url}: {e}")
+            feeds.append(None)
+    return None if None in feeds else feeds
 
-    if getattr(feed, "bozo", False):
-        print(f"⚠️ Предупреждение: {getattr(feed, 'bozo_exception', 'unknown parse issue')}")
 
-    episodes = []
-    for idx, entry in enumerate(feed.entries or [], 1):
+def load_feed_cache(path: str) -> dict:
+    """Sidecar-кэш условного GET: ETag/Last-Modified лент с прошлого запуска."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            data = _loads(f.read())
+            if isinstance(data, dict):
+                return data
+    except Exception as e:
+        print(f"⚠️ Не удалось прочитать {path}: {e}")
+    return {}
+
+
+def _url_key(rss_url: str) -> str:
+    # сам URL (он в секретах) в кэш не пишем — только хэш
+    return hashlib.sha256(rss_url.encode("utf-8")).hexdigest()
+
+
+def _run_fingerprint(rss_urls: list[str], out_path: str) -> str:
+    """Отпечаток всего, кроме содержимого лент, от чего зависит результат.
+
+    Набор лент (хэши URL), скрипт, extras-карта, путь вывода.
+    """
+    h = hashlib.sha256(out_path.encode("utf-8"))
+    for key in sorted(_url_key(u) for u in rss_urls):
+        h.update(key.encode("ascii"))
+    for path in (__file__, EXTRAS_FILE):
         try:
-            title = entry.get("title", "Без названия").strip()
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()
+
+
+def _count_episodes(path: str) -> int | None:
+    try:
+        with open(path, "rb") as f:
+            data = _loads(f.read())
+    except Exception:
+        return None
+    return len(data) if isinstance(data, list) else None
+
+
+def _feeds_failed(out_path: str) -> int:
+    # без одной из лент файл вышел бы урезанным — лучше оставить прежний
+    print(f"❌ Не все ленты загрузились — {out_path} не перезаписываю")
+    return 0
+
+
+def parse_rss_to_json(rss_urls: list[str] | str, out_path: str) -> int:
+    if isinstance(rss_urls, str):
+        rss_urls = [rss_urls]
+    for rss_url in rss_urls:
+        print(f"Загружаю RSS: {rss_url}")
+
+    # условный GET имеет смысл, только если прошлый результат на месте
+    # и с тех пор не менялись ни набор лент, ни скрипт, ни extras-карта
+    fingerprint = _run_fingerprint(rss_urls, out_path)
+    feed_cache = load_feed_cache(FEED_CACHE)
+    known = {}
+    if feed_cache.get("fingerprint") == fingerprint and os.path.exists(out_path):
+        known = feed_cache.get("feeds") or {}
+
+    # загрузка и разбор лент — в основном ожидание сети, поэтому параллельно
+    with ThreadPoolExecutor(max_workers=min(8, len(rss_urls))) as ex:
+        feeds = _gather_feeds(
+            rss_urls,
+            [ex.submit(load_feed, u, known.get(_url_key(u))) for u in rss_urls],
+        )
+        if feeds is None:
+            return _feeds_failed(out_path)
+
+        if all(feed_entries is None for feed_entries, _, _ in feeds):
+            count = _count_episodes(out_path)
+            if count is not None:
+                print(f"✅ Ленты не изменились (304) — оставляю {out_path} ({count} выпусков)")
+                return count
+        # если изменилась только часть лент, остальные всё равно нужно разобрать —
+        # перекачиваем их безусловно, тем же пулом
+        stale = [i for i, feed in enumerate(feeds) if feed[0] is None]
+        refetched = _gather_feeds(
+            [rss_urls[i] for i in stale],
+            [ex.submit(load_feed, rss_urls[i]) for i in stale],
+        )
+        if refetched is None:
+            return _feeds_failed(out_path)
+        for i, feed in zip(stale, refetched):
+            feeds[i] = feed
+    extras_map = load_extras_map(EXTRAS_FILE)
+
+    entries = []
+    for rss_url, (feed_entries, warning, _) in zip(rss_urls, feeds):
+        if warning:
+            print(f"⚠️ Предупреждение ({rss_url}): {warning}")
+        entries.extend(feed_entries)
+
+    episodes: list[Episode] = []
+    # локальные ссылки вместо LOAD_GLOBAL/LOAD_ATTR на каждой итерации
+    _clean = clean_html
+    _parse_dur = parse_duration
+    _append = episodes.append
+    _to_int = to_int_or_str
+    _norm = norm_epnum
+    _extras_get = extras_map.get
+    for idx, entry in enumerate(entries, 1):
+        try:
+            # FeedParserDict.get() на каждый ключ гоняет алиасы и спец-ключи;
+            # обычный dict с теми же «сырыми» ключами заметно дешевле
+            # (записи из lxml_entry — уже обычные dict, их не копируем)
+            raw = entry if type(entry) is dict else dict(entry)
+            title = raw.get("title", "Без названия").strip()
             # описание: content -> summary_detail -> summary/description
             description = (
-                (entry.get("content") or [{}])[0].get("value")
-                or (entry.get("summary_detail") or {}).get("value")
-                or entry.get("summary")
-                or entry.get("description")
+                (raw.get("content") or [{}])[0].get("value")
+                or (raw.get("summary_detail") or {}).get("value")
+                or raw.get("summary")
+                or _description_alias(raw)
                 or ""
             )
-            description = clean_html(description)
-            link = entry.get("link", "").strip()
+            description = _clean(description)
+            link = raw.get("link", "").strip()
 
             pub_dt, date_str, year = coerce_datetime(entry)
             audio_url = pick_audio(entry)
             image_url = pick_image(entry)
 
-            duration = parse_duration(
-                entry.get("itunes_duration")
-                or entry.get("itunes:duration")
-                or entry.get("duration")
-            )
-            episode_number = to_int_or_str(entry.get("itunes_episode") or entry.get("episode"))
-            season = to_int_or_str(entry.get("itunes_season") or entry.get("season"))
-            episode_type = entry.get("itunes_episodetype") or entry.get("episodeType") or ""
-
-            guid = entry.get("guid") or entry.get("id") or ""
-            explicit = str(entry.get("itunes_explicit") or "").lower() in {"yes", "true", "1"}
-
-            num_key = norm_epnum(episode_number)
-            extra = extras_map.get(num_key, {})  # ← вот её и не хватало
-
-            episodes.append(
-                {
-                    "name": title,
-                    "desc": description,
-                    "link": link,
-                    "audio_url": audio_url,
-                    "image": image_url,
-                    "date": date_str,
-                    "year": year,
-                    "duration": duration,
-                    "episode_number": episode_number,
-                    "season": season,
-                    "episode_type": episode_type,
-                    "guid": guid,
-                    "explicit": explicit,
-                    "page": extra.get("page", ""),
-                    # «сырая» дата для сортировки/отладки (ISO, UTC)
-                    "pub_iso": pub_dt.astimezone(timezone.utc).isoformat() if pub_dt else "",
-                }
+            duration = _parse_dur(_first(raw, "itunes_duration", "itunes:duration", "duration"))
+            episode_number = _to_int(_first(raw, "itunes_episode", "episode"))
+            season = _to_int(_first(raw, "itunes_season", "season"))
+            episode_type = _first(raw, "itunes_episodetype", "episodeType")
+
+            # у feedparser guid лежит под ключом "id"
+            guid = _first(raw, "guid", "id")
+            explicit = str(raw.get("itunes_explicit") or "").lower() in _EXPLICIT_TRUE
+
+            num_key = _norm(episode_number)
+            extra = _extras_get(num_key, {})  # ← вот её и не хватало
+
+            _append(
+                Episode(
+                    name=title,
+                    desc=description,
+                    link=link,
+                    audio_url=audio_url,
+                    image=image_url,
+                    date=date_str,
+                    year=year,
+                    duration=duration,
+                    episode_number=episode_number,
+                    season=season,
+                    episode_type=episode_type,
+                    guid=guid,
+                    explicit=explicit,
+                    page=extra.get("page", ""),
+                    pub_iso=pub_dt.isoformat() if pub_dt else "",
+                )
             )
         except Exception as e:
             print(f"❌ Ошибка в записи {idx}: {e}")
             continue
 
-    # сортировка по реальной дате, затем по имени как стабильный fallback
-    episodes.sort(
-        key=lambda x: (x["pub_iso"] or "", x["name"]),
-        reverse=True,
-    )
-
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(episodes, f, ensure_ascii=False, indent=2)
+    # сортировка по реальной дате, затем по имени как стабильный fallback;
+    # pub_iso — ISO-строка в UTC (или ""), поэтому сравнивается как строка
+    episodes.sort(key=attrgetter("pub_iso", "name"), reverse=True)
+
+    # пишем по одному выпуску: в памяти всегда только один закодированный эпизод,
+    # а формат файла тот же, что у json.dump(..., indent=2)
+    with open(out_path, "wb") as f:
+        if not episodes:
+            f.write(b"[]")
+        else:
+            f.write(b"[\n")
+            for i, ep in enumerate(episodes):
+                if i:
+                    f.write(b",\n")
+                f.write(b"  ")
+                f.write(_dumps(ep).replace(b"\n", b"\n  "))
+            f.write(b"\n]")
+
+    if FEED_CACHE:
+        feed_cache = {
+            "fingerprint": fingerprint,
+            "feeds": {
+                _url_key(rss_url): validators
+                for rss_url, (_, _, validators) in zip(rss_urls, feeds)
+                if validators
+            },
+        }
+        with open(FEED_CACHE, "wb") as f:
+            f.write(_dumps(feed_cache))
 
     print(f"✅ Сохранено {len(episodes)} выпусков → {out_path}")
     if episodes:
         latest = episodes[0]
-        print(f"🎙 {latest['name']}  📅 {latest['date']}")
+        print(f"🎙 {latest.name}  📅 {latest.date}")
 
     # нулевое количество — сигнализируем ошибкой возврата
     return len(episodes)
@@ -257,7 +721,12 @@ def parse_rss_to_json(rss_url: str, out_path: str) -> int:
 
 def main():
     ap = argparse.ArgumentParser(description="Parse podcast RSS to JSON")
-    ap.add_argument("--rss", default=DEFAULT_RSS, help="RSS URL (env RSS_URL by default)")
+    ap.add_argument(
+        "--rss",
+        nargs="+",
+        default=[DEFAULT_RSS],
+        help="One or more RSS URLs (env RSS_URL by default)",
+    )
     ap.add_argument("--out", default=DEFAULT_OUT, help="Output JSON file path")
     args = ap.parse_args()
 